@@ -1,19 +1,163 @@
 # File: convert_webp_image_gui.py
 
+import errno
+import io
 import os
 import logging
+import multiprocessing
+import queue
+import re
+import shutil
+import subprocess
+import sys
 import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 from tkinter import ttk
-from PIL import Image, UnidentifiedImageError
+import PIL
+from PIL import Image, UnidentifiedImageError, features
+# Register the plugins used for reading and writing up front, so Image.open and Image.save find them
+# directly instead of falling back to Pillow's lazy Image.init() scan of every plugin.
+from PIL import (GifImagePlugin, JpegImagePlugin, PdfImagePlugin,  # noqa: F401
+                 PngImagePlugin, TiffImagePlugin, WebPImagePlugin)
 from datetime import datetime
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
+# Number of log lines kept in the GUI log area; the full log is kept separately for saving
+LOG_BUFFER_LINES = 1000
 
-def convert_webp_image(webp_path, output_dir, output_format, overwrite=False):
+# Case-insensitive .webp extension match, compiled once so filtering paths doesn't lowercase each one
+_WEBP_EXT_RE = re.compile(r'\.webp\Z', re.IGNORECASE)
+
+# WebP files at least this large are piped through the libwebp/libjpeg-turbo command line tools when
+# they are installed and the output is JPEG, skipping Pillow's Python-side buffer handling.
+CLI_MIN_FILE_BYTES = 10_000_000
+_DWEBP = shutil.which('dwebp')
+_CJPEG = shutil.which('cjpeg')
+
+# Pillow format name and save options per output format, built once at import rather than on every call
+_SAVE_PARAMS = {
+    'jpeg': ('JPEG', {'optimize': False}),
+    'png': ('PNG', {}),
+    'gif': ('GIF', {}),
+    'tiff': ('TIFF', {}),
+    'pdf': ('PDF', {'resolution': 100.0}),
+}
+
+
+def _is_webp(path):
+    """Return True if path has a .webp extension, in any letter case."""
+    return _WEBP_EXT_RE.search(path) is not None
+
+
+def _has_webp_magic(webp_path):
+    """Return True if the file starts with a RIFF/WEBP header (b'RIFF????WEBP')."""
+    with open(webp_path, 'rb') as f:
+        header = f.read(12)
+    return header[:4] == b'RIFF' and header[8:12] == b'WEBP'
+
+
+def _finalize_tmp(tmp_path, output_path, overwrite):
+    """
+    Move a fully written temporary file to output_path.
+
+    With overwrite off the file is hard-linked into place, which fails with FileExistsError if
+    output_path exists, including under different letter case on case-insensitive filesystems or
+    when another file in the same batch claimed the name first. os.replace would overwrite it.
+    """
+    if overwrite:
+        # Keep the replaced file's permission bits rather than the fresh temp file's umask default
+        try:
+            shutil.copymode(output_path, tmp_path)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, output_path)
+        return
+    try:
+        os.link(tmp_path, output_path)
+    except FileExistsError:
+        raise
+    except OSError:
+        # Filesystems without hard links (e.g. FAT32) fall back to check-then-rename
+        if os.path.exists(output_path):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), output_path)
+        os.replace(tmp_path, output_path)
+        return
+    os.remove(tmp_path)
+
+
+def _save_atomic(img, output_path, save_format, save_params, overwrite=True):
+    """
+    Save img to output_path through a temporary file in the same directory and an atomic rename.
+
+    An interrupted conversion therefore never leaves a truncated file under the final name,
+    and an existing file is only replaced once the new one has been fully written.
+    With overwrite off, an existing output_path raises FileExistsError and is left untouched.
+    With it on, the replaced file's permission bits are kept, but it becomes a new file, so
+    ownership and hard links to the old one are not carried over.
+    """
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            img.save(f, save_format, **save_params)
+        _finalize_tmp(tmp_path, output_path, overwrite)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _convert_with_cli(webp_path, output_path, overwrite=True):
+    """
+    Convert a .webp file to JPEG by piping dwebp into cjpeg, writing atomically like _save_atomic.
+
+    Returns:
+        bool: True if both tools succeeded, False otherwise (the caller falls back to Pillow).
+    """
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    dwebp = None
+    try:
+        dwebp = subprocess.Popen([_DWEBP, webp_path, '-ppm', '-o', '-'],
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        # Quality 75 matches Pillow's default so output does not depend on which path was taken
+        cjpeg = subprocess.Popen([_CJPEG, '-quality', '75', '-outfile', tmp_path],
+                                 stdin=dwebp.stdout, stderr=subprocess.DEVNULL)
+        # Let dwebp see a broken pipe if cjpeg exits early
+        dwebp.stdout.close()
+        cjpeg_status = cjpeg.wait()
+        dwebp_status = dwebp.wait()
+        if dwebp_status == 0 and cjpeg_status == 0:
+            _finalize_tmp(tmp_path, output_path, overwrite)
+            return True
+        logger.warning("dwebp/cjpeg failed for %s (exit codes %s, %s)", webp_path, dwebp_status, cjpeg_status)
+    except FileExistsError:
+        # Not a tool failure, so don't fall back to Pillow; the caller reports the skip
+        os.remove(tmp_path)
+        raise
+    except OSError as e:
+        logger.warning("dwebp/cjpeg failed for %s: %s", webp_path, e)
+        # cjpeg may have failed to start after dwebp did; don't leave dwebp running
+        if dwebp is not None:
+            dwebp.stdout.close()
+            dwebp.kill()
+            dwebp.wait()
+
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+    return False
+
+
+def convert_webp_image(webp_path, output_dir, output_format, overwrite=False, output_path=None, max_dim=None,
+                       existing_set=None):
     """
     Convert a .webp image to specified format and save it to the specified output directory.
 
@@ -22,70 +166,151 @@ def convert_webp_image(webp_path, output_dir, output_format, overwrite=False):
         output_dir (str): Directory where the converted file will be saved.
         output_format (str): The desired output format ('jpeg', 'png', 'gif', 'tiff', 'pdf').
         overwrite (bool): Whether to overwrite existing files.
+        output_path (str): Precomputed destination path. Derived from webp_path and output_dir if omitted.
+        max_dim (int): If given, downscale so neither side exceeds this many pixels, keeping the aspect ratio.
+        existing_set (frozenset): File names already present in output_dir. Replaces a stat() per file if given.
 
     Returns:
         bool: True if conversion was successful, False otherwise.
     """
     try:
-        if not os.path.isfile(webp_path):
-            logging.error(f"File not found: {webp_path}")
+        if output_path is None:
+            output_filename = os.path.splitext(os.path.basename(webp_path))[0] + f'.{output_format}'
+            output_path = os.path.join(output_dir, output_filename)
+
+        # A 12-byte header read rejects missing or non-WebP input without constructing a Pillow image.
+        # It runs before the existing-output check so bad inputs are never reported as skipped.
+        if not _has_webp_magic(webp_path):
+            logger.error("File format is not .webp: %s", webp_path)
             return False
 
-        logging.info(f"Opening image: {webp_path}")
-        img = Image.open(webp_path)
-
-        if img.format.lower() != 'webp':
-            logging.error(f"File format is not .webp: {webp_path}")
-            return False
-
-        original_size = img.size
-        logging.info(f"Original image size: {original_size}")
-
-        img = img.convert("RGB")
-        output_filename = os.path.splitext(os.path.basename(webp_path))[0] + f'.{output_format}'
-        output_path = os.path.join(output_dir, output_filename)
-
-        if os.path.exists(output_path):
+        # Checked before decoding so files that will be skipped cost nothing
+        if existing_set is None:
+            output_exists = os.path.exists(output_path)
+        else:
+            output_exists = os.path.basename(output_path) in existing_set
+        if output_exists:
             if overwrite:
-                logging.info(f"Overwriting existing file: {output_path}")
+                logger.info("Overwriting existing file: %s", output_path)
             else:
-                logging.info(f"File already exists and overwrite is disabled: {output_path}")
+                logger.info("File already exists and overwrite is disabled: %s", output_path)
                 return True
 
-        if output_format == 'pdf':
-            img.save(output_path, 'PDF', resolution=100.0)
+        # The CLI tools cannot downscale, so any max_dim sends every file to Pillow. Checking whether a
+        # file is already small enough would mean parsing its header here first, which is deliberately skipped.
+        if (output_format == 'jpeg' and not max_dim and _DWEBP and _CJPEG
+                and os.path.getsize(webp_path) >= CLI_MIN_FILE_BYTES):
+            logger.info("Converting with dwebp/cjpeg: %s", webp_path)
+            converted_with_cli = _convert_with_cli(webp_path, output_path, overwrite)
         else:
-            img.save(output_path, output_format.upper())
-
-        # Verify the created file to avoid false positives
-        if not os.path.isfile(output_path):
-            logging.error(f"Failed to create {output_path}")
+            converted_with_cli = False
+
+        if not converted_with_cli:
+            logger.info("Opening image: %s", webp_path)
+            # The header check above already identified the file, so skip probing other formats
+            img = Image.open(webp_path, formats=('WEBP',))
+            original_size = img.size
+            logger.info("Original image size: %s", original_size)
+
+            if max_dim and max(original_size) > max_dim:
+                # thumbnail() asks the decoder for a draft first and then does a cheap integer reduce()
+                # before the final resample, instead of resampling from the full-size image.
+                img.thumbnail((max_dim, max_dim))
+                logger.info("Downscaled to: %s", img.size)
+
+            # convert() always returns a new image, even for a no-op, so only pay for the copy
+            # when the decoder did not already produce RGB (e.g. WebP with alpha decodes to RGBA).
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            save_format, save_params = _SAVE_PARAMS.get(output_format, (output_format.upper(), {}))
+            _save_atomic(img, output_path, save_format, save_params, overwrite)
+
+        # Verify the created file to avoid false positives. Encoding never changes the pixel
+        # dimensions, so checking the file is non-empty is enough without decoding it again.
+        if not os.path.isfile(output_path) or os.path.getsize(output_path) == 0:
+            logger.error("Failed to create %s", output_path)
             return False
 
-        logging.info(f"Saved {output_format.upper()} image to: {output_path}")
-
-        converted_img = Image.open(output_path)
-        converted_size = converted_img.size
-
-        if original_size == converted_size:
-            logging.info(f"Size verified for {output_path}: {converted_size}")
-        else:
-            logging.warning(f"Size mismatch for {output_path}: original {original_size}, converted {converted_size}")
-
+        logger.info("Saved %s image to: %s", output_format.upper(), output_path)
+        return True
+    except FileExistsError:
+        # The output appeared after the existence check, or exists under different letter case
+        logger.info("File already exists and overwrite is disabled: %s", output_path)
         return True
     except FileNotFoundError:
-        logging.error(f"File not found error: {webp_path}")
+        logger.error("File not found error: %s", webp_path)
     except UnidentifiedImageError:
-        logging.error(f"Cannot identify image file: {webp_path}")
+        logger.error("Cannot identify image file: %s", webp_path)
     except PermissionError:
-        logging.error(f"Permission denied for file {webp_path}")
+        logger.error("Permission denied for file %s", webp_path)
     except OSError as e:
-        logging.error(f"OS error for file {webp_path}: {e}")
+        logger.error("OS error for file %s: %s", webp_path, e)
     except Exception as e:
-        logging.error(f"Unexpected error for {webp_path}: {e}")
+        logger.error("Unexpected error for %s: %s", webp_path, e)
     return False
 
 
+def convert_directory(src_dir, output_dir, output_format, overwrite=False, max_dim=None):
+    """
+    Convert every .webp file directly inside src_dir.
+
+    os.scandir caches each entry's file type from the directory read, so this avoids the
+    per-file stat and path manipulation of converting a list of paths one by one.
+
+    Args:
+        src_dir (str): Directory containing the .webp files.
+        output_dir (str): Directory where the converted files will be saved.
+        output_format (str): The desired output format ('jpeg', 'png', 'gif', 'tiff', 'pdf').
+        overwrite (bool): Whether to overwrite existing files.
+        max_dim (int): If given, downscale so neither side exceeds this many pixels.
+
+    Returns:
+        tuple: (success_count, error_count)
+    """
+    with os.scandir(src_dir) as it:
+        entries = [e for e in it if _is_webp(e.name) and e.is_file()]
+    existing = frozenset(os.listdir(output_dir))
+
+    success_count = 0
+    error_count = 0
+    for entry in entries:
+        output_path = os.path.join(output_dir, entry.name[:-5] + f'.{output_format}')
+        if convert_webp_image(entry.path, output_dir, output_format, overwrite,
+                              output_path=output_path, max_dim=max_dim, existing_set=existing):
+            success_count += 1
+        else:
+            error_count += 1
+    return success_count, error_count
+
+
+def log_codec_support():
+    """
+    Log whether Pillow's JPEG encoder is backed by libjpeg-turbo and whether Pillow-SIMD is loaded.
+
+    Official Pillow wheels bundle libjpeg-turbo, whose SIMD colour conversion, DCT and
+    Huffman kernels make a separate JPEG encoder unnecessary. Source builds linked
+    against stock libjpeg fall back to the slower scalar code paths.
+
+    Pillow-SIMD is an optional drop-in replacement that speeds up the RGB conversion;
+    its releases carry a ".postN" version suffix. Regular Pillow works unchanged.
+
+    Also reports whether the dwebp/cjpeg command line tools were found for large JPEG conversions.
+    """
+    if '.post' in PIL.__version__:
+        logger.info("Using Pillow-SIMD %s", PIL.__version__)
+    else:
+        logger.info("Using Pillow %s", PIL.__version__)
+
+    if features.check_feature('libjpeg_turbo'):
+        logger.info("JPEG encoder: libjpeg-turbo %s", features.version_feature('libjpeg_turbo'))
+    else:
+        logger.warning("JPEG encoder: libjpeg-turbo not available, JPEG output will be slower. "
+                       "Reinstall Pillow from an official wheel to enable it.")
+
+    if _DWEBP and _CJPEG:
+        logger.info("Large WebP files will be converted to JPEG with %s and %s", _DWEBP, _CJPEG)
+
+
 class WebpImageConverterApp:
     def __init__(self, root):
         self.root = root
@@ -95,9 +320,24 @@ class WebpImageConverterApp:
         self.output_dir = ''
         self.overwrite = tk.BooleanVar()
         self.output_format = tk.StringVar(value="jpeg")
-        self.cancel_flag = threading.Event()
+        self.cancel_events = set()
+        # Tk is not thread-safe, so the worker thread only ever posts updates here and
+        # the main thread applies them in _drain_ui.
+        self.ui_queue = queue.Queue()
+        # Full copy of the log for auto_save_log, so saving never reads text back out of Tk
+        self._log_mirror = io.StringIO()
+        self._log_pending = []
+        self._log_dirty = False
+
+        # A single long-lived worker runs queued conversion jobs one after another, so
+        # pressing Convert during a batch queues more work instead of starting a second writer.
+        self.job_queue = queue.Queue()
+        self.worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self.worker.start()
 
         self.create_widgets()
+        self._drain_ui()
+        self._flush_log()
 
     def create_widgets(self):
         # Source files selection
@@ -150,8 +390,8 @@ class WebpImageConverterApp:
         try:
             files = filedialog.askopenfilenames(filetypes=[("WebP files", "*.webp")])
             if files:
-                valid_files = [f for f in files if f.lower().endswith('.webp')]
-                invalid_files = set(files) - set(valid_files)
+                valid_files = [f for f in files if _is_webp(f)]
+                invalid_files = [f for f in files if not _is_webp(f)]
                 if invalid_files:
                     messagebox.showwarning("Invalid Files",
                                            f"These files are not .webp and were skipped: {', '.join(invalid_files)}")
@@ -170,11 +410,6 @@ class WebpImageConverterApp:
             self.log(f"Error selecting output directory: {e}")
 
     def start_conversion(self):
-        self.cancel_flag.clear()
-        self.convert_thread = threading.Thread(target=self.convert_files)
-        self.convert_thread.start()
-
-    def convert_files(self):
         if not self.source_files:
             messagebox.showerror("Error", "No source files selected.")
             self.log("Conversion failed: No source files selected.")
@@ -185,61 +420,176 @@ class WebpImageConverterApp:
             self.log("Conversion failed: No output directory selected.")
             return
 
-        success_count = 0
-        error_count = 0
-        total_files = len(self.source_files)
-        self.progress["maximum"] = total_files
+        # Settings are captured here on the main thread; each job gets its own cancel event
+        cancel_event = threading.Event()
+        self.cancel_events.add(cancel_event)
+        self.job_queue.put((list(self.source_files), self.output_dir, self.output_format.get(),
+                            self.overwrite.get(), cancel_event))
+        self.log(f"Queued {len(self.source_files)} files for conversion.")
 
-        for index, webp_file in enumerate(self.source_files):
-            if self.cancel_flag.is_set():
-                self.log("Conversion cancelled by user.")
-                messagebox.showinfo("Cancelled", "Conversion process was cancelled.")
-                break
+    def _worker_loop(self):
+        while True:
+            job = self.job_queue.get()
             try:
-                if convert_webp_image(webp_file, self.output_dir, self.output_format.get(), self.overwrite.get()):
+                self._run_job(job)
+            except Exception as e:
+                self.log(f"Conversion job failed: {e}")
+            finally:
+                self.cancel_events.discard(job[-1])
+                self.job_queue.task_done()
+
+    def _run_job(self, job):
+        source_files, output_dir, output_format, overwrite, cancel_event = job
+        if cancel_event.is_set():
+            self.log(f"Skipped cancelled job of {len(source_files)} files.")
+            return
+
+        success_count = 0
+        error_count = 0
+        total_files = len(source_files)
+        self.ui_queue.put(('progress', 0))
+        self.ui_queue.put(('maximum', total_files))
+
+        existing = frozenset(os.listdir(output_dir))
+
+        # Each conversion is independent and CPU-bound, so fan out across processes
+        # rather than threads to sidestep the GIL.
+        # No more workers than files, and ProcessPoolExecutor rejects more than 61 on Windows
+        max_workers = min(total_files, os.cpu_count() or 1)
+        if sys.platform == 'win32':
+            max_workers = min(max_workers, 61)
+        # Spawn rather than fork everywhere: forking while the Tk and worker threads are running can deadlock
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {}
+            for webp_file in source_files:
+                output_filename = os.path.splitext(os.path.basename(webp_file))[0] + f'.{output_format}'
+                # Send each task only the name it needs rather than pickling the whole listing per file
+                future = executor.submit(convert_webp_image, webp_file, output_dir, output_format, overwrite,
+                                         output_path=os.path.join(output_dir, output_filename),
+                                         existing_set=existing & {output_filename})
+                futures[future] = webp_file
+
+            recorded = set()
+            for future in as_completed(futures):
+                if cancel_event.is_set():
+                    # Drops queued conversions and waits for the running ones, which are counted below
+                    executor.shutdown(cancel_futures=True)
+                    self.log("Conversion cancelled by user.")
+                    self.ui_queue.put(('dialog', messagebox.showinfo, "Cancelled", "Conversion process was cancelled."))
+                    break
+
+                recorded.add(future)
+                if self._record_result(futures[future], future):
                     success_count += 1
-                    self.log(f"Successfully converted: {webp_file}")
                 else:
                     error_count += 1
-                    self.log(f"Failed to convert: {webp_file}")
-            except Exception as e:
-                error_count += 1
-                self.log(f"Error converting {webp_file}: {e}")
-
-            self.progress["value"] = index + 1
-            self.root.update_idletasks()
+                self.ui_queue.put(('progress', len(recorded)))
+
+            # Conversions that finished after cancelling were still written, so the summary must include them
+            for future, webp_file in futures.items():
+                if future in recorded or not future.done() or future.cancelled():
+                    continue
+                recorded.add(future)
+                if self._record_result(webp_file, future):
+                    success_count += 1
+                else:
+                    error_count += 1
+                self.ui_queue.put(('progress', len(recorded)))
 
         self.log(f"Conversion completed: {success_count} successful, {error_count} errors")
-        if not self.cancel_flag.is_set():
-            messagebox.showinfo("Conversion Completed",
-                                f"Conversion completed: {success_count} successful, {error_count} errors")
+        if not cancel_event.is_set():
+            self.ui_queue.put(('dialog', messagebox.showinfo, "Conversion Completed",
+                               f"Conversion completed: {success_count} successful, {error_count} errors"))
+
+        # Queued behind the log updates above so the saved log includes them
+        self.ui_queue.put(('save_log', output_dir))
 
-        self.auto_save_log()
+    def _record_result(self, webp_file, future):
+        """Log the outcome of one finished conversion and return True if it succeeded."""
+        try:
+            if future.result():
+                self.log(f"Successfully converted: {webp_file}")
+                return True
+            self.log(f"Failed to convert: {webp_file}")
+        except Exception as e:
+            self.log(f"Error converting {webp_file}: {e}")
+        return False
 
     def cancel_conversion(self):
-        self.cancel_flag.set()
+        for cancel_event in list(self.cancel_events):
+            cancel_event.set()
         self.log("Cancellation requested...")
 
     def log(self, message):
+        # Safe to call from the worker thread: messages are queued, recorded by _drain_ui and
+        # rendered by _flush_log at most every 100 ms, however fast they arrive.
+        self.ui_queue.put(('log', message))
+
+    def _append_log(self, message):
+        self._log_mirror.write(message)
+        self._log_mirror.write("\n")
+        self._log_pending.append(message)
+        self._log_dirty = True
+
+    def _render_log(self):
+        if not self._log_dirty:
+            return
         self.log_area.config(state='normal')
-        self.log_area.insert(tk.END, message + "\n")
+        self.log_area.insert(tk.END, "\n".join(self._log_pending) + "\n")
+        # Keep the widget to LOG_BUFFER_LINES so layout cost stays bounded
+        excess = int(self.log_area.index('end-1c').split('.')[0]) - 1 - LOG_BUFFER_LINES
+        if excess > 0:
+            self.log_area.delete("1.0", f"{excess + 1}.0")
         self.log_area.yview(tk.END)
         self.log_area.config(state='disabled')
+        self._log_pending.clear()
+        self._log_dirty = False
+
+    def _flush_log(self):
+        self._render_log()
+        self.root.after(100, self._flush_log)
+
+    def _drain_ui(self):
+        for _ in range(64):
+            try:
+                item = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
 
-    def auto_save_log(self):
+            kind = item[0]
+            if kind == 'log':
+                self._append_log(item[1])
+            elif kind == 'progress':
+                self.progress["value"] = item[1]
+            elif kind == 'maximum':
+                self.progress["maximum"] = item[1]
+            elif kind == 'dialog':
+                # Show the messages leading up to the dialog before it blocks
+                self._render_log()
+                item[1](*item[2:])
+            elif kind == 'save_log':
+                self.auto_save_log(item[1])
+
+        self.root.after(50, self._drain_ui)
+
+    def auto_save_log(self, output_dir=None):
         try:
-            log_content = self.log_area.get("1.0", tk.END)
-            if log_content.strip():
+            log_content = self._log_mirror.getvalue()
+            if log_content:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 log_filename = f"conversion_log_{timestamp}.txt"
-                log_path = os.path.join(self.output_dir, log_filename)
-                with open(log_path, 'w') as log_file:
+                log_path = os.path.join(output_dir or self.output_dir, log_filename)
+                with open(log_path, 'w', buffering=1 << 20) as log_file:
                     log_file.write(log_content)
                 self.log(f"Log automatically saved to {log_path}")
         except Exception as e:
             self.log(f"Error saving log: {e}")
 
     def clear_log(self):
+        self._log_mirror = io.StringIO()
+        self._log_pending.clear()
+        self._log_dirty = False
         self.log_area.config(state='normal')
         self.log_area.delete("1.0", tk.END)
         self.log_area.config(state='disabled')
@@ -247,6 +597,7 @@ class WebpImageConverterApp:
 
 
 if __name__ == "__main__":
+    log_codec_support()
     root = tk.Tk()
     app = WebpImageConverterApp(root)
     root.mainloop()